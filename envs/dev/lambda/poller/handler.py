@@ -1,48 +1,161 @@
-import os, json, base64, time, urllib.parse, urllib.request
+import os, sys, json, base64, time, random, urllib.parse
+from collections import OrderedDict
 import boto3
+import urllib3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-secrets = boto3.client("secretsmanager")
-
-_SECRET_CACHE: dict[str, tuple[float, str]] = {}
+try:
+    # orjson is several times faster than stdlib json for both dumps and
+    # loads; it emits UTF-8 bytes directly so no ensure_ascii/encode cost.
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+
+    _json_loads = orjson.loads
+except ImportError:  # runtime without an orjson layer
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=str).encode()
+
+    _json_loads = json.loads
+
+# Keep the TLS session to Secrets Manager warm between invocations and let
+# _get_secret_value_with_retry own retries instead of stacking botocore's on
+# top of ours.
+_SM_CFG = Config(
+    tcp_keepalive=True,
+    retries={"mode": "standard", "total_max_attempts": 1},
+    connect_timeout=2,
+    read_timeout=3,
+)
+
+# boto3 client creation costs ~100-300ms; defer it until the handler actually
+# needs Secrets Manager (invocations using the API_KEY env var never do).
+_clients = {}
+
+
+def _secrets():
+    c = _clients.get("sm")
+    if c is None:
+        c = _clients["sm"] = boto3.client("secretsmanager", config=_SM_CFG)
+    return c
+
+# Module-level pool so warm Lambda containers reuse the keep-alive socket and
+# TLS session across invocations instead of re-handshaking on every poll.
+# Retries stay off (the handler implements its own status-aware retry loop),
+# but redirects are still followed, matching the old urlopen behavior.
+_POOL = urllib3.PoolManager(
+    num_pools=8,
+    maxsize=4,
+    retries=urllib3.Retry(
+        total=None,
+        connect=0,
+        read=0,
+        other=0,
+        redirect=3,
+        raise_on_redirect=False,
+    ),
+    timeout=urllib3.Timeout(connect=5.0, read=10.0),
+)
+
+# name -> (expiry, raw value, parsed JSON or None for plain-string secrets).
+# LRU-bounded so a long-lived container polling many apps can't grow it
+# without bound; expiries use time.monotonic() to be immune to clock jumps.
+_SECRET_CACHE: OrderedDict[str, tuple[float, str, dict | list | None]] = (
+    OrderedDict()
+)
+_SECRET_CACHE_MAX = 64
+_SECRET_CACHE_LOW = int(0.7 * _SECRET_CACHE_MAX)
+_SECRET_CACHE_HIGH = int(0.9 * _SECRET_CACHE_MAX)
 _SECRET_TTL_SECONDS = float(os.environ.get("API_SECRET_TTL_SECONDS", "300"))
+
+
+def _effective_secret_ttl() -> float:
+    # Scale TTL down linearly as the cache fills (full TTL below 70% of
+    # capacity, zero at 90%) so a crowded cache turns over faster.
+    m = max(
+        0.0,
+        (len(_SECRET_CACHE) - _SECRET_CACHE_LOW)
+        / (_SECRET_CACHE_HIGH - _SECRET_CACHE_LOW),
+    )
+    return _SECRET_TTL_SECONDS * (1.0 - min(m, 1.0))
+# Binary stdout, bound once: one write per log line, no per-call attribute
+# chain and no text-layer UTF-8 re-encode. Must be flushed explicitly: the
+# Lambda runtime only auto-flushes text-layer writes, and a frozen or
+# reclaimed environment would otherwise drop buffered lines.
+_OUT = sys.stdout.buffer
+
 _LOG_LEVEL = (os.environ.get("LOG_LEVEL") or "INFO").upper()
 _RETURN_DEBUG = (os.environ.get("RETURN_DEBUG") or "false").lower() == "true"
 _MAX_BODY_CHARS = int(os.environ.get("MAX_BODY_CHARS", "240000"))
+# Read cap in bytes: worst-case UTF-8 is 4 bytes per char, so this is the
+# most we could ever need to produce _MAX_BODY_CHARS characters.
+_MAX_BODY_BYTES = _MAX_BODY_CHARS * 4
 
 
-def _should_log(level: str) -> bool:
-    order = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40}
-    return order.get(level, 20) >= order.get(
-        "DEBUG" if _LOG_LEVEL == "DEBUG" else _LOG_LEVEL, 20
-    )
+_LEVEL_ORDER = {"DEBUG": 10, "INFO": 20, "WARN": 30, "WARNING": 30, "ERROR": 40}
+_LEVEL_THRESHOLD = _LEVEL_ORDER.get(_LOG_LEVEL, 20)
+# Precomputed per-level booleans so the hot-path check is one dict lookup.
+_LEVEL_ENABLED = {lvl: n >= _LEVEL_THRESHOLD for lvl, n in _LEVEL_ORDER.items()}
+# Guard for DEBUG-only _log calls: skips the call (and kwargs packing)
+# entirely when DEBUG is off.
+_DEBUG_ON = _LEVEL_ENABLED["DEBUG"]
+
+_REDACT_HEADERS = frozenset(
+    {"authorization", "x-api-key", "proxy-authorization"}
+)
+
+# Timestamps have 1s resolution, so only re-format when the second changes
+_LAST_TS = [0, ""]
+
+
+def _iso_now() -> str:
+    s = int(time.time())
+    if s != _LAST_TS[0]:
+        _LAST_TS[0] = s
+        _LAST_TS[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(s))
+    return _LAST_TS[1]
 
 
 def _log(level: str, step: str, message: str, **kwargs):
-    if not _should_log(level):
+    if not _LEVEL_ENABLED.get(level, 20 >= _LEVEL_THRESHOLD):
         return
-    # Avoid leaking secrets in logs
-    if "headers" in kwargs and isinstance(kwargs["headers"], dict):
-        redacted = {}
-        for k, v in kwargs["headers"].items():
-            if k.lower() in {
-                "authorization",
-                "x-api-key",
-                "proxy-authorization",
-            }:
-                redacted[k] = "***"
-            else:
-                redacted[k] = v
-        kwargs["headers"] = redacted
+    # Avoid leaking secrets in logs; skip the copy when nothing is sensitive
+    h = kwargs.get("headers")
+    if isinstance(h, dict) and not _REDACT_HEADERS.isdisjoint(
+        k.lower() for k in h
+    ):
+        kwargs["headers"] = {
+            k: ("***" if k.lower() in _REDACT_HEADERS else v)
+            for k, v in h.items()
+        }
     record = {
         "level": level,
         "step": step,
         "message": message,
-        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "time": _iso_now(),
     }
     if kwargs:
         record.update(kwargs)
-    print(json.dumps(record, ensure_ascii=False))
+    _OUT.write(_json_dumps(record) + b"\n")
+    _OUT.flush()
+
+
+class _PlainNumberDeserializer(TypeDeserializer):
+    # Keep the original int/float contract instead of boto3's Decimal
+    def _deserialize_n(self, value):
+        try:
+            return float(value) if "." in str(value) else int(value)
+        except Exception:
+            return value
+
+
+_DESERIALIZE = _PlainNumberDeserializer().deserialize
+_ATTRVAL_KEYS = frozenset(
+    {"S", "N", "B", "BOOL", "NULL", "M", "L", "SS", "NS", "BS"}
+)
 
 
 def _from_attrval(value):
@@ -51,19 +164,18 @@ def _from_attrval(value):
     Safe to call on already-plain values; returns input if no conversion applies.
     """
     if isinstance(value, dict):
-        if "S" in value:
-            return value["S"]
-        if "N" in value:
-            n = value["N"]
+        if len(value) == 1 and next(iter(value)) in _ATTRVAL_KEYS:
             try:
-                return float(n) if "." in str(n) else int(n)
+                return _DESERIALIZE(value)
             except Exception:
-                return n
-        if "M" in value and isinstance(value["M"], dict):
-            return {k: _from_attrval(v) for k, v in value["M"].items()}
-        if "L" in value and isinstance(value["L"], list):
-            return [_from_attrval(v) for v in value["L"]]
-        # Fallback: attempt shallow conversion
+                pass
+            # Mixed typed/plain containers make TypeDeserializer raise;
+            # unwrap the M/L shell and convert members as before
+            if "M" in value and isinstance(value["M"], dict):
+                return {k: _from_attrval(v) for k, v in value["M"].items()}
+            if "L" in value and isinstance(value["L"], list):
+                return [_from_attrval(v) for v in value["L"]]
+        # Plain dict (or unrecognized shape): convert values shallowly
         return {k: _from_attrval(v) for k, v in value.items()}
     if isinstance(value, list):
         return [_from_attrval(v) for v in value]
@@ -84,21 +196,27 @@ def _as_number(val, default=None):
 
 
 def _as_number_list(vals, default_list=None):
-    if isinstance(vals, list):
-        out = []
-        for v in vals:
-            n = _as_number(v, None)
-            if n is None:
-                try:
-                    n = int(v)  # last resort string->int
-                except Exception:
-                    continue
-            out.append(int(n))
-        return out
-    # Try AttributeValue list
+    # Unwrap an AttributeValue list, then coerce elements directly rather
+    # than dispatching through _as_number per item
     if isinstance(vals, dict) and "L" in vals:
-        return _as_number_list(vals["L"], default_list)
-    return default_list or []
+        vals = vals["L"]
+    if not isinstance(vals, list):
+        return default_list or []
+    out = []
+    for v in vals:
+        if isinstance(v, (int, float)):
+            out.append(int(v))
+        elif isinstance(v, dict) and "N" in v:
+            try:
+                out.append(int(float(v["N"])))
+            except Exception:
+                continue
+        else:
+            try:
+                out.append(int(v))  # last resort string->int
+            except Exception:
+                continue
+    return out
 
 
 def _get_secret_value(name: str, json_key: str | None = None) -> str:
@@ -108,13 +226,13 @@ def _get_secret_value(name: str, json_key: str | None = None) -> str:
     json_key: if the secret is a json object, the key of the secret - {"api_key":"...","other":"..."} and you want just "api_key"
     return: the secret value
     """
-    resp = secrets.get_secret_value(SecretId=name)
+    resp = _secrets().get_secret_value(SecretId=name)
     val = resp.get("SecretString")
     if not val and "SecretBinary" in resp:
         val = resp["SecretBinary"].decode("utf-8")
     if json_key:
         # In case the secret is store as a json object and not a literal string value
-        data = json.loads(val)
+        data = _json_loads(val)
         return data[json_key]
     return val
 
@@ -122,44 +240,56 @@ def _get_secret_value(name: str, json_key: str | None = None) -> str:
 def _get_secret_value_with_retry(
     name: str,
     json_key: str | None = None,
-    attempts: int = 3,
+    attempts: int = 2,
     backoff: float = 1.5,
 ) -> str:
-    now = time.time()
+    now = time.monotonic()
     # cached contain each app with the time of cache
     cached = _SECRET_CACHE.get(name)
     if cached and cached[0] > now:
-        _log(
-            "DEBUG",
-            "secret_cache",
-            "Using cached secret",
-            secret_name=name,
-            cached_until=cached[0],
-        )
-        cached_val = cached[1]
-        if json_key:
+        _SECRET_CACHE.move_to_end(name)
+        if _DEBUG_ON:
+            _log(
+                "DEBUG",
+                "secret_cache",
+                "Using cached secret",
+                secret_name=name,
+                cached_until=cached[0],
+            )
+        if json_key and cached[2] is not None:
             try:
-                return json.loads(cached_val)[json_key]
+                # Parsed once at insert time; no json.loads per cache hit
+                return cached[2][json_key]
             except Exception:
                 # if the json key is not valid, we will not use the cached value
                 pass
-        return cached_val
+        return cached[1]
 
     last_err = None
     for i in range(1, attempts + 1):
         try:
-            _log(
-                "DEBUG",
-                "secret_fetch",
-                "Fetching secret",
-                secret_name=name,
-                attempt=i,
-            )
+            if _DEBUG_ON:
+                _log(
+                    "DEBUG",
+                    "secret_fetch",
+                    "Fetching secret",
+                    secret_name=name,
+                    attempt=i,
+                )
             val = _get_secret_value(name, json_key=None)
-            _SECRET_CACHE[name] = (now + _SECRET_TTL_SECONDS, val)
+            parsed = None
+            if val and val[:1] in "{[":
+                try:
+                    parsed = _json_loads(val)
+                except Exception:
+                    parsed = None
+            _SECRET_CACHE[name] = (now + _effective_secret_ttl(), val, parsed)
+            _SECRET_CACHE.move_to_end(name)
+            while len(_SECRET_CACHE) > _SECRET_CACHE_MAX:
+                _SECRET_CACHE.popitem(last=False)
             if json_key:
                 try:
-                    return json.loads(val)[json_key]
+                    return parsed[json_key]
                 except Exception as e:
                     last_err = e
                     raise
@@ -223,27 +353,36 @@ def _http_request(
     start_ts = time.monotonic()
     if query:
         qs = urllib.parse.urlencode(query, doseq=True)
-        sep = "&" if urllib.parse.urlparse(url).query else "?"
+        # Cheap substring scan instead of a full urlparse just for .query
+        sep = "&" if "?" in url else "?"
         url = f"{url}{sep}{qs}"
     data = None
     if body is not None:
         if isinstance(body, (dict, list)):
-            data = json.dumps(body).encode()
+            data = _json_dumps(body)
             headers = {**(headers or {}), "Content-Type": "application/json"}
         elif isinstance(body, str):
             data = body.encode()
         else:
             data = body  # bytes
-    req = urllib.request.Request(
-        url=url, method=method.upper(), headers=headers or {}, data=data
+    resp = _POOL.request(
+        method.upper(),
+        url,
+        headers=headers or {},
+        body=data,
+        timeout=urllib3.Timeout(connect=5.0, read=timeout),
+        preload_content=False,
     )
     try:
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            duration_ms = int((time.monotonic() - start_ts) * 1000)
-            return resp.status, dict(resp.headers), resp.read(), duration_ms
-    except Exception:
-        duration_ms = int((time.monotonic() - start_ts) * 1000)
-        raise
+        # Read at most one byte past the cap so the caller can detect
+        # truncation without buffering an arbitrarily large body.
+        raw = resp.read(_MAX_BODY_BYTES + 1)
+    finally:
+        resp.release_conn()
+    duration_ms = int((time.monotonic() - start_ts) * 1000)
+    # resp.headers is an HTTPHeaderDict (case-insensitive .get); callers
+    # materialize a plain dict only when echoing headers into the result
+    return resp.status, resp.headers, raw, duration_ms
 
 
 def lambda_handler(event, context):
@@ -295,6 +434,13 @@ def lambda_handler(event, context):
         timeout=timeout_val,
     )
 
+    # Never sleep past the function timeout; cap total retry idle at 30s
+    try:
+        budget = context.get_remaining_time_in_millis() / 1000.0 - 1.0
+    except Exception:
+        budget = 30.0
+    deadline = time.monotonic() + min(budget, 30.0)
+
     attempt = 0
     last_err = None
     last_status = None
@@ -330,30 +476,27 @@ def lambda_handler(event, context):
             )
             ok = 200 <= status < 300
             if ok or status not in retry_on:
-                content_type = ""
                 try:
-                    # Headers can have different cases
-                    content_type = (
-                        resp_headers.get("Content-Type")
-                        or resp_headers.get("content-type")
-                        or ""
-                    )
+                    # HTTPHeaderDict lookups are case-insensitive
+                    content_type = resp_headers.get("Content-Type") or ""
                 except Exception:
                     content_type = ""
 
+                truncated = isinstance(body, (bytes, bytearray)) and len(
+                    body
+                ) > _MAX_BODY_BYTES
                 body_text = (
-                    body.decode(errors="replace")
+                    body[:_MAX_BODY_BYTES].decode("utf-8", "replace")
                     if isinstance(body, (bytes, bytearray))
                     else str(body)
                 )
-                truncated = False
                 if len(body_text) > _MAX_BODY_CHARS:
                     truncated = True
                     body_text = body_text[:_MAX_BODY_CHARS]
                 result = {
                     "ok": ok,
                     "status": status,
-                    "headers": resp_headers,
+                    "headers": dict(resp_headers),
                     "body": body_text,
                     "body_truncated": truncated,
                     "content_type": content_type,
@@ -384,7 +527,15 @@ def lambda_handler(event, context):
                 error=last_err,
             )
         if attempt < max_attempts:
-            time.sleep(backoff**attempt)
+            # Jitter (50-100% of the exponential step) spreads retries from
+            # concurrent executions; the deadline keeps billed idle bounded.
+            delay = min(
+                backoff**attempt * (0.5 + random.random() * 0.5),
+                deadline - time.monotonic(),
+            )
+            if delay <= 0:
+                break
+            time.sleep(delay)
 
     result = {
         "ok": False,
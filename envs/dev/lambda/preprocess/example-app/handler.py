@@ -1,8 +1,25 @@
-import json, os, datetime
-from collections import defaultdict
-import boto3
+import json, os, sys, time
+
+try:
+    # orjson parses the (potentially ~240KB) poll body several times faster
+    # than stdlib json.
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+
+    _json_loads = orjson.loads
+except ImportError:  # runtime without an orjson layer
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=str).encode()
+
+    _json_loads = json.loads
+
+# Binary stdout, bound once: one write per EMF line, no text-layer re-encode.
+# Must be flushed explicitly: the Lambda runtime only auto-flushes text-layer
+# writes, and an unflushed EMF line is a dropped metric.
+_OUT = sys.stdout.buffer
 
-cw = boto3.client("cloudwatch")
 NAMESPACE = os.environ.get("METRIC_NAMESPACE", "Observability/ExampleApp")
 
 STATUS_MAP = {
@@ -44,12 +61,15 @@ ISSUE_SEV_SCORE = {
 }
 
 
-def _now_iso():
-    return datetime.datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+# Lowercases and drops spaces in one C-level pass instead of
+# .replace(" ", "").lower() allocating two intermediate strings.
+_NORM_TABLE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz", " "
+)
 
 
-def _norm_status(raw):
-    return STATUS_MAP.get((raw or "").replace(" ", "").lower(), ("UNKNOWN", 1))
+def _now_iso():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
 def _extract_arrays(body):
@@ -64,11 +84,19 @@ def _extract_arrays(body):
 
 
 def _is_issue_open(it: dict) -> bool:
-    status = (it.get("status") or "").replace(" ", "").lower()
+    status = (it.get("status") or "").translate(_NORM_TABLE)
     return status not in {"servicerestored", "resolved", "closed"}
 
 
-def lambda_handler(event, context):
+def lambda_handler(
+    event,
+    context,
+    # Default-arg bindings turn the per-service table lookups into
+    # LOAD_FAST instead of LOAD_GLOBAL in the hot loop.
+    _STATUS=STATUS_MAP,
+    _SEV=ISSUE_SEV_SCORE,
+    _UNKNOWN=("UNKNOWN", 1),
+):
     app = event.get("appName") or "unknown-app"
     poll = event.get("poll") or {}
     if not (poll.get("ok") and poll.get("status") == 200):
@@ -79,33 +107,35 @@ def lambda_handler(event, context):
         }
 
     try:
-        body = json.loads(poll.get("body") or "{}")
+        body = _json_loads(poll.get("body") or "{}")
     except Exception as e:
         return {"ok": False, "error": f"invalid json: {e}"}
 
     health_overviews, issues = _extract_arrays(body)
 
-    issues_by_service = defaultdict(list)
+    # Single pass over issues: count open issues and track the highest open
+    # severity per service, so the overview loop below is two dict lookups
+    # instead of a filter plus a max per overview.
+    open_count_by_service = {}
+    max_sev_by_service = {}
     for it in issues:
         svc = it.get("service") or it.get("affectedWorkload")
-        if svc:
-            issues_by_service[svc].append(it)
+        if not svc or not _is_issue_open(it):
+            continue
+        open_count_by_service[svc] = open_count_by_service.get(svc, 0) + 1
+        sev = _SEV.get((it.get("severity") or "").lower(), 1)
+        if sev > max_sev_by_service.get(svc, 0):
+            max_sev_by_service[svc] = sev
 
     services = []
     for ho in health_overviews:
         name = ho.get("service") or ho.get("id") or "unknown"
         raw = ho.get("status")
-        cat, sev_code = _norm_status(raw)
-        open_issues = [
-            i for i in issues_by_service.get(name, []) if _is_issue_open(i)
-        ]
-        highest_issue_sev = max(
-            (
-                ISSUE_SEV_SCORE.get((i.get("severity") or "").lower(), 1)
-                for i in open_issues
-            ),
-            default=0,
+        cat, sev_code = _STATUS.get(
+            (raw or "").translate(_NORM_TABLE), _UNKNOWN
         )
+        open_issues = open_count_by_service.get(name, 0)
+        highest_issue_sev = max_sev_by_service.get(name, 0)
         sev = max(sev_code, highest_issue_sev)
 
         services.append(
@@ -115,69 +145,68 @@ def lambda_handler(event, context):
                 "rawStatus": raw,
                 "statusCategory": cat,
                 "severity": sev,
-                "openIssues": len(open_issues),
+                "openIssues": open_issues,
                 "highestIncidentSeverity": highest_issue_sev,
             }
         )
 
     total = len(services) or 1
-    ok = sum(1 for s in services if s["statusCategory"] == "OK")
-    degraded = sum(1 for s in services if s["statusCategory"] == "DEGRADED")
-    outage = sum(1 for s in services if s["statusCategory"] == "OUTAGE")
-    recovering = sum(
-        1 for s in services if s["statusCategory"] == "RECOVERING"
-    )
-    investigating = sum(
-        1 for s in services if s["statusCategory"].startswith("INVESTIGATING")
-    )
+    # Single pass over services instead of six generator scans
+    ok = degraded = outage = recovering = investigating = critical = 0
+    for s in services:
+        cat = s["statusCategory"]
+        sev = s["severity"]
+        if sev > critical:
+            critical = sev
+        if cat == "OK":
+            ok += 1
+        elif cat == "DEGRADED":
+            degraded += 1
+        elif cat == "OUTAGE":
+            outage += 1
+        elif cat == "RECOVERING":
+            recovering += 1
+        elif cat == "INVESTIGATING":
+            investigating += 1
     availability = round(100.0 * ok / total, 2)
-    critical = max((s["severity"] for s in services), default=0)
 
-    # Emit CloudWatch metrics (best-effort)
-    try:
-        cw.put_metric_data(
-            Namespace=NAMESPACE,
-            MetricData=[
+    # Emit CloudWatch metrics via Embedded Metric Format: one structured log
+    # line the log pipeline extracts asynchronously, instead of a synchronous
+    # PutMetricData round-trip on every invocation.
+    emf = {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [
                 {
-                    "MetricName": "OverallAvailabilityPercent",
-                    "Value": availability,
-                    "Unit": "Percent",
-                    "Dimensions": [{"Name": "AppName", "Value": app}],
-                },
-                {
-                    "MetricName": "ServicesOutageCount",
-                    "Value": outage,
-                    "Unit": "Count",
-                    "Dimensions": [{"Name": "AppName", "Value": app}],
-                },
-                {
-                    "MetricName": "ServicesDegradedCount",
-                    "Value": degraded,
-                    "Unit": "Count",
-                    "Dimensions": [{"Name": "AppName", "Value": app}],
-                },
-                {
-                    "MetricName": "ServicesRecoveringCount",
-                    "Value": recovering,
-                    "Unit": "Count",
-                    "Dimensions": [{"Name": "AppName", "Value": app}],
-                },
-                {
-                    "MetricName": "ServicesInvestigatingCount",
-                    "Value": investigating,
-                    "Unit": "Count",
-                    "Dimensions": [{"Name": "AppName", "Value": app}],
-                },
-                {
-                    "MetricName": "CriticalScore",
-                    "Value": critical,
-                    "Unit": "Count",
-                    "Dimensions": [{"Name": "AppName", "Value": app}],
-                },
+                    "Namespace": NAMESPACE,
+                    "Dimensions": [["AppName"]],
+                    "Metrics": [
+                        {
+                            "Name": "OverallAvailabilityPercent",
+                            "Unit": "Percent",
+                        },
+                        {"Name": "ServicesOutageCount", "Unit": "Count"},
+                        {"Name": "ServicesDegradedCount", "Unit": "Count"},
+                        {"Name": "ServicesRecoveringCount", "Unit": "Count"},
+                        {
+                            "Name": "ServicesInvestigatingCount",
+                            "Unit": "Count",
+                        },
+                        {"Name": "CriticalScore", "Unit": "Count"},
+                    ],
+                }
             ],
-        )
-    except Exception:
-        pass
+        },
+        "AppName": app,
+        "OverallAvailabilityPercent": availability,
+        "ServicesOutageCount": outage,
+        "ServicesDegradedCount": degraded,
+        "ServicesRecoveringCount": recovering,
+        "ServicesInvestigatingCount": investigating,
+        "CriticalScore": critical,
+    }
+    _OUT.write(_json_dumps(emf) + b"\n")
+    _OUT.flush()
 
     record = {
         "appName": app,